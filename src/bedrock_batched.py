@@ -0,0 +1,273 @@
+"""
+Client-side batching of concurrent questions into single Bedrock calls.
+
+The interactive CLI asks one question at a time and does not need this.
+When the chatbot is wrapped by a service that receives many questions at
+once, BatchedAnswerer coalesces questions that arrive within a short window
+into one multi-question request. This saves an HTTP round-trip and repeated
+prompt prefill per question.
+"""
+
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import List, Dict, Any, Tuple
+
+from .bedrock_llm import build_messages_body, generate_answer, invoke_claude
+from .logger import setup_logger
+from .retriever import format_context
+from .config import config
+
+
+logger = setup_logger()
+
+# Pending request: (question, context chunks, future for the answer)
+_Request = Tuple[str, List[Dict[str, Any]], "Future[str]"]
+
+# Marks the start of each answer in a multi-question response
+_ANSWER_HEADER = re.compile(r"^### ANSWER (\d+)\s*$", re.MULTILINE)
+
+_BATCH_INSTRUCTIONS = """
+You will receive several independent questions, each with its own CONTEXT.
+Answer each question using ONLY its own CONTEXT.
+Start each answer with a line "### ANSWER <number>" matching the question number,
+and answer every question in order.
+""".strip()
+
+
+def build_batch_prompt(requests: List[_Request]) -> List[Dict[str, Any]]:
+    """
+    Build the user message content for several questions at once.
+    """
+    content: List[Dict[str, Any]] = [
+        {"type": "text", "text": _BATCH_INSTRUCTIONS}
+    ]
+    for i, (question, context_chunks, _) in enumerate(requests, start=1):
+        context = format_context(context_chunks)
+        content.append({
+            "type": "text",
+            "text": f"QUESTION {i}:\n{question}\n\nCONTEXT {i}:\n{context}",
+        })
+    return content
+
+
+def split_batch_answer(text: str, n_questions: int) -> List[str] | None:
+    """
+    Split a multi-question response into one answer per question.
+
+    Returns None if the response doesn't contain exactly one answer for
+    each question number.
+    """
+    headers = list(_ANSWER_HEADER.finditer(text))
+    numbers = [int(h.group(1)) for h in headers]
+    if numbers != list(range(1, n_questions + 1)):
+        return None
+
+    answers: List[str] = []
+    for h, next_h in zip(headers, headers[1:] + [None]):
+        end = next_h.start() if next_h is not None else len(text)
+        answers.append(text[h.end():end].strip())
+    return answers
+
+
+class BatchedAnswerer:
+    """
+    Answer questions from many threads, batching those that arrive together.
+
+    Questions are queued by submit(); a question whose future is cancelled
+    before its batch is sent is skipped. A background thread waits up to
+    `window_ms` after the first queued question (or until `max_batch_size`
+    questions are queued) and then answers them with a single Bedrock call.
+    If the batched call fails or its response can't be split back into
+    per-question answers, each question of that batch is answered
+    individually; errors are delivered through the questions' futures.
+
+    The background thread only collects batches. Bedrock calls run on a
+    thread pool (`max_concurrency` workers), so a slow call doesn't hold up
+    later batches, and fallback calls run concurrently too.
+
+    Usage
+    -----
+    with BatchedAnswerer() as answerer:
+        answer = answerer.answer(question, chunks)
+    """
+
+    def __init__(
+        self,
+        window_ms: float | None = None,
+        max_batch_size: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> None:
+        self.window_s = (
+            window_ms if window_ms is not None else config.batch_window_ms
+        ) / 1000
+        self.max_batch_size = max_batch_size or config.batch_max_size
+
+        self._queue: "queue.Queue[_Request | None]" = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency or config.batch_max_concurrency,
+            thread_name_prefix="bedrock-call",
+        )
+        # Claimed question futures not yet resolved (waited on by close())
+        self._in_flight: "set[Future[str]]" = set()
+        self._in_flight_lock = threading.Lock()
+        self._worker = threading.Thread(
+            target=self._run, name="bedrock-batcher", daemon=True
+        )
+        self._worker.start()
+
+    def submit(
+        self, question: str, context_chunks: List[Dict[str, Any]]
+    ) -> "Future[str]":
+        """
+        Queue a question; the returned future resolves to its answer.
+
+        Raises RuntimeError once close() has been called.
+        """
+        future: "Future[str]" = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchedAnswerer is closed")
+            self._queue.put((question, context_chunks, future))
+        return future
+
+    def answer(self, question: str, context_chunks: List[Dict[str, Any]]) -> str:
+        """
+        Answer a question, blocking until its batch has been processed.
+        """
+        return self.submit(question, context_chunks).result()
+
+    def close(self) -> None:
+        """
+        Answer all queued questions, then stop the background threads.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join()
+
+        # Fallback calls are submitted from pool threads, so wait for every
+        # question to be resolved before shutting the pool down
+        with self._in_flight_lock:
+            in_flight = list(self._in_flight)
+        wait(in_flight)
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "BatchedAnswerer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        """Collect batches from the queue and answer them until closed."""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            closing = False
+            deadline = time.monotonic() + self.window_s
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    closing = True
+                    break
+                batch.append(request)
+
+            # Claim each future; callers can no longer cancel it afterwards,
+            # and questions cancelled while queued are dropped
+            batch = [
+                request for request in batch
+                if request[2].set_running_or_notify_cancel()
+            ]
+            for _, _, future in batch:
+                self._track(future)
+
+            if batch:
+                self._executor.submit(self._answer_batch_safely, batch)
+
+            if closing:
+                return
+
+    def _track(self, future: "Future[str]") -> None:
+        """Record a claimed question until its future is resolved."""
+        with self._in_flight_lock:
+            self._in_flight.add(future)
+        future.add_done_callback(self._untrack)
+
+    def _untrack(self, future: "Future[str]") -> None:
+        with self._in_flight_lock:
+            self._in_flight.discard(future)
+
+    def _answer_batch_safely(self, batch: List[_Request]) -> None:
+        """Run _answer_batch(), failing any futures it leaves unresolved."""
+        try:
+            self._answer_batch(batch)
+        except Exception as e:
+            logger.error(f"Failed to answer batch: {e}")
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    def _answer_batch(self, batch: List[_Request]) -> None:
+        """Answer a batch of requests and resolve their futures."""
+        if len(batch) == 1:
+            self._answer_individually(batch)
+            return
+
+        logger.info(f"Answering {len(batch)} questions in one Bedrock call")
+
+        try:
+            body = build_messages_body(
+                build_batch_prompt(batch),
+                max_tokens=min(
+                    config.max_tokens * len(batch),
+                    config.batch_max_output_tokens,
+                ),
+            )
+            answers = split_batch_answer(invoke_claude(body), len(batch))
+        except Exception as e:
+            logger.warning(
+                f"Batched call failed ({e}); answering individually.")
+            self._answer_individually(batch)
+            return
+
+        if answers is None:
+            logger.warning(
+                "Could not split batched answer; answering individually.")
+            self._answer_individually(batch)
+            return
+
+        for (_, _, future), answer in zip(batch, answers):
+            future.set_result(answer)
+
+    def _answer_individually(self, batch: List[_Request]) -> None:
+        """Answer each request with its own, concurrent Bedrock call."""
+        # The first request is answered on this pool thread, the rest on others
+        for request in batch[1:]:
+            self._executor.submit(self._answer_one, request)
+        self._answer_one(batch[0])
+
+    @staticmethod
+    def _answer_one(request: _Request) -> None:
+        """Answer a single request and resolve its future."""
+        question, context_chunks, future = request
+        try:
+            future.set_result(generate_answer(question, context_chunks))
+        except Exception as e:
+            future.set_exception(e)
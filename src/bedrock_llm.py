@@ -6,7 +6,8 @@ responses. Retrieval context and model settings are controlled via config.
 """
 
 import json
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator
 
 import boto3
 from botocore.config import Config as BotoConfig
@@ -18,91 +19,141 @@ from .config import config
 logger = setup_logger()
 
 # Bedrock client
-_bedrock_runtime = boto3.client(
-    "bedrock-runtime",
-    region_name=config.aws_region,
-    config=BotoConfig(retries={"max_attempts": 10, "mode": "standard"}),
-)
-
-# Prompt building
 
 
-def build_prompt(question: str, context_chunks: List[Dict[str, Any]]) -> str:
+@lru_cache(maxsize=1)
+def _client() -> Any:
     """
-    Build a prompt string combining retrieved context with the user question.
+    Create the Bedrock runtime client on first use and reuse it afterwards.
+
+    Deferred so importing this module (and starting the CLI) doesn't wait
+    on credential resolution and client setup.
     """
-    context = format_context(context_chunks)
+    return boto3.client(
+        "bedrock-runtime",
+        region_name=config.aws_region,
+        config=BotoConfig(retries={"max_attempts": 10, "mode": "standard"}),
+    )
 
-    prompt = f"""
-You are a helpful support assistant for the SmartHeat Pro thermostat.
 
-You must ONLY use the information in the CONTEXT below to answer the user's question.
-If the answer is not in the context, say you don't know and suggest that the user contact SmartHeat support.
+# Prompt building
 
-CONTEXT:
-{context}
+# Static instructions, sent as the system prompt so they form a cacheable prefix
+SYSTEM_PROMPT = """
+You are a helpful support assistant for the SmartHeat Pro thermostat.
 
-QUESTION:
-{question}
+You must ONLY use the information in the CONTEXT provided with each question to answer it.
+If the answer is not in the context, say you don't know and suggest that the user contact SmartHeat support.
 
 Answer in a concise, clear way, in 3 to 6 sentences at most.
 If a specific document/source is important, mention it briefly.
-"""
-    return prompt.strip()
+""".strip()
+
+# Rough characters-per-token ratio used to size prompt prefixes for caching
+_CHARS_PER_TOKEN = 4
+
+_CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _is_cacheable(prefix_chars: int) -> bool:
+    """
+    Whether a prompt prefix of this many characters should get a cache point.
+
+    Bedrock only caches prefixes of at least config.prompt_cache_min_tokens
+    tokens, so smaller cache points would add nothing.
+    """
+    return (
+        config.prompt_caching
+        and prefix_chars // _CHARS_PER_TOKEN >= config.prompt_cache_min_tokens
+    )
+
+
+def build_system() -> List[Dict[str, Any]]:
+    """
+    Build the system prompt blocks, marked as a cache point if cacheable.
+    """
+    block: Dict[str, Any] = {"type": "text", "text": SYSTEM_PROMPT}
+    if _is_cacheable(len(SYSTEM_PROMPT)):
+        block["cache_control"] = _CACHE_CONTROL
+    return [block]
+
+
+def build_prompt(
+    question: str, context_chunks: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Build the user message content: retrieved context, then the question.
+
+    The context gets its own cache point when the prefix it closes (system
+    prompt + context) is long enough for Bedrock to cache, so repeated
+    questions over the same chunks skip its prefill.
+    """
+    # Scores vary per query; leaving them out keeps the context block
+    # byte-identical (and so cacheable) whenever the same chunks come back
+    context = format_context(context_chunks, include_scores=False)
+
+    context_block: Dict[str, Any] = {
+        "type": "text",
+        "text": f"CONTEXT:\n{context}",
+    }
+    if _is_cacheable(len(SYSTEM_PROMPT) + len(context_block["text"])):
+        context_block["cache_control"] = _CACHE_CONTROL
+
+    question_block = {"type": "text", "text": f"QUESTION:\n{question}"}
+    return [context_block, question_block]
 
 # Model invocation
 
 
-def generate_answer(
+def _build_request_body(
     question: str,
     context_chunks: List[Dict[str, Any]],
+    max_tokens: int | None,
+    temperature: float | None,
+) -> Dict[str, Any]:
+    """
+    Build the Anthropic Messages request body for a single question.
+    """
+
+    if not context_chunks:
+        logger.warning(
+            "No context chunks retrieved; answering without context.")
+
+    prompt = build_prompt(question, context_chunks)
+    return build_messages_body(prompt, max_tokens, temperature)
+
+
+def build_messages_body(
+    content: List[Dict[str, Any]],
     max_tokens: int | None = None,
     temperature: float | None = None,
-) -> str:
+) -> Dict[str, Any]:
     """
-    Generate an LLM answer using AWS Bedrock (Claude 3).
+    Build an Anthropic Messages request body around user message content.
 
     Parameters
     ----------
-    question : str
-        User question.
-    context_chunks : list of dict
-        Retrieved chunks to include in the prompt.
+    content : list of dict
+        Content blocks of the user message.
     max_tokens : int, optional
         Override for token limit; falls back to config.
     temperature : float, optional
         Override for temperature; falls back to config.
-
-    Returns
-    -------
-    str
-        The model-produced answer.
     """
 
-    if not context_chunks:
-        logger.warning(
-            "No context chunks retrieved; answering without context.")
-
-    prompt = build_prompt(question, context_chunks)
-
     # Fill defaults from central config if not provided
     if max_tokens is None:
         max_tokens = config.max_tokens
     if temperature is None:
         temperature = config.temperature
 
-    logger.info(
-        f"Calling Bedrock model: {config.model_id} in region: {config.aws_region}"
-    )
-
-    body = {
+    return {
         "anthropic_version": "bedrock-2023-05-31",
+        "system": build_system(),
         "messages": [
             {
                 "role": "user",
-                "content": [
-                    {"type": "text", "text": prompt}
-                ],
+                "content": content,
             }
         ],
         "max_tokens": max_tokens,
@@ -110,10 +161,44 @@ def generate_answer(
         "top_p": config.top_p,
     }
 
+
+def _log_usage(usage: Dict[str, Any]) -> None:
+    """Log token usage, including prompt cache hits, from a response."""
+    logger.info(
+        "Received response from Bedrock "
+        f"(input tokens: {usage.get('input_tokens')}, "
+        f"cache read: {usage.get('cache_read_input_tokens', 0)}, "
+        f"cache write: {usage.get('cache_creation_input_tokens', 0)}, "
+        f"output tokens: {usage.get('output_tokens')})."
+    )
+
+
+def invoke_claude(body: Dict[str, Any]) -> str:
+    """
+    Send an Anthropic Messages request body to Bedrock and return the text.
+
+    Parameters
+    ----------
+    body : dict
+        Request body, e.g. from build_messages_body().
+
+    Returns
+    -------
+    str
+        The model-produced text, stripped.
+    """
+
+    logger.info(
+        f"Calling Bedrock model: {config.model_id} in region: {config.aws_region}"
+    )
+
+    performance = "optimized" if config.latency_optimized else "standard"
+
     try:
-        response = _bedrock_runtime.invoke_model(
+        response = _client().invoke_model(
             modelId=config.model_id,
             body=json.dumps(body),
+            performanceConfigLatency=performance,
         )
     except Exception as e:
         logger.error(f"Error calling Bedrock: {e}")
@@ -133,5 +218,109 @@ def generate_answer(
         logger.error(f"Unexpected Bedrock response format: {payload}")
         raise e
 
-    logger.info("Received response from Bedrock.")
+    _log_usage(payload.get("usage", {}))
     return answer.strip()
+
+
+def generate_answer(
+    question: str,
+    context_chunks: List[Dict[str, Any]],
+    max_tokens: int | None = None,
+    temperature: float | None = None,
+) -> str:
+    """
+    Generate an LLM answer using AWS Bedrock (Claude 3).
+
+    Parameters
+    ----------
+    question : str
+        User question.
+    context_chunks : list of dict
+        Retrieved chunks to include in the prompt.
+    max_tokens : int, optional
+        Override for token limit; falls back to config.
+    temperature : float, optional
+        Override for temperature; falls back to config.
+
+    Returns
+    -------
+    str
+        The model-produced answer.
+    """
+
+    body = _build_request_body(
+        question, context_chunks, max_tokens, temperature)
+    return invoke_claude(body)
+
+
+def generate_answer_stream(
+    question: str,
+    context_chunks: List[Dict[str, Any]],
+    max_tokens: int | None = None,
+    temperature: float | None = None,
+) -> Iterator[str]:
+    """
+    Stream an LLM answer from AWS Bedrock (Claude 3) as it is generated.
+
+    Takes the same parameters as generate_answer().
+
+    Yields
+    ------
+    str
+        Text deltas of the answer, in order. Like generate_answer(), the
+        answer as a whole has no leading or trailing whitespace.
+    """
+
+    body = _build_request_body(
+        question, context_chunks, max_tokens, temperature)
+
+    logger.info(
+        f"Streaming Bedrock model: {config.model_id} in region: {config.aws_region}"
+    )
+
+    performance = "optimized" if config.latency_optimized else "standard"
+
+    try:
+        response = _client().invoke_model_with_response_stream(
+            modelId=config.model_id,
+            body=json.dumps(body),
+            performanceConfigLatency=performance,
+        )
+    except Exception as e:
+        logger.error(f"Error calling Bedrock: {e}")
+        raise
+
+    usage: Dict[str, Any] = {}
+    answer_parts: List[str] = []
+    # Trailing whitespace is held back until more text follows it
+    held_ws = ""
+
+    for event in response["body"]:
+        chunk = event.get("chunk")
+        if chunk is None:
+            continue
+
+        payload = json.loads(chunk["bytes"])
+        event_type = payload.get("type")
+
+        # Claude-specific streaming event format
+        if event_type == "message_start":
+            usage.update(payload["message"].get("usage", {}))
+        elif event_type == "content_block_delta":
+            text = payload["delta"].get("text", "")
+            if not answer_parts:
+                text = text.lstrip()
+
+            stripped = text.rstrip()
+            if stripped:
+                piece = held_ws + stripped
+                answer_parts.append(piece)
+                held_ws = text[len(stripped):]
+                yield piece
+            elif answer_parts:
+                held_ws += text
+        elif event_type == "message_delta":
+            usage.update(payload.get("usage", {}))
+
+    _log_usage(usage)
+    logger.debug(f"Streamed answer: {''.join(answer_parts)!r}")
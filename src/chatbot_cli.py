@@ -5,12 +5,12 @@ This module handles:
 1. User input loop
 2. Retrieval of relevant chunks
 3. LLM answer generation via Bedrock
-4. Displaying formatted responses
+4. Displaying responses as they stream in
 """
 
 from .logger import setup_logger
 from .retriever import retrieve_relevant_chunks
-from .bedrock_llm import generate_answer
+from .bedrock_llm import generate_answer_stream
 from .config import config
 
 
@@ -51,16 +51,22 @@ def main() -> None:
             top_sources = {c['source'] for c in chunks}
             logger.info(f"Top sources used: {', '.join(top_sources)}")
 
-        # 2) Call Bedrock LLM
+        # 2) Call Bedrock LLM and 3) show the answer as it streams in
+        print("\nBot: ", end="", flush=True)
+        streamed = False
         try:
-            answer = generate_answer(question, chunks)
+            for piece in generate_answer_stream(question, chunks):
+                print(piece, end="", flush=True)
+                streamed = True
         except Exception as e:
+            # Finish the "Bot: " line (on a new line if text was streamed)
+            if streamed:
+                print()
+            print("Sorry, something went wrong while generating the answer.")
             logger.error(f"Failed to generate answer: {e}")
-            print("Bot: Sorry, something went wrong while generating the answer.")
             continue
 
-        # 3) Show answer
-        print("\nBot:", answer)
+        print()
         print("-" * 80)
 
 
@@ -0,0 +1,106 @@
+"""
+Document reading and chunking for the ingestion pipeline.
+
+Kept free of the embedding model and FAISS so that ingestion's worker
+processes, which only read and split files, start quickly even on
+platforms that spawn fresh interpreters (Windows, macOS).
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Any, Iterator
+
+from semantic_text_splitter import TextSplitter
+
+from .config import config
+
+
+# Read size for streaming large documents
+READ_BLOCK_SIZE = 64 * 1024
+
+
+@lru_cache(maxsize=None)
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> TextSplitter:
+    """Create (once per process) a splitter for the given chunk settings."""
+    return TextSplitter(capacity=chunk_size, overlap=chunk_overlap)
+
+
+def split_text(text: str, chunk_size: int, chunk_overlap: int) -> List[str]:
+    """Split text into stripped, non-empty chunks."""
+    splitter = _get_splitter(chunk_size, chunk_overlap)
+    chunks = (ch.strip() for ch in splitter.chunks(text))
+    return [ch for ch in chunks if ch]
+
+
+def iter_text_blocks(path: Path) -> Iterator[str]:
+    """
+    Stream a text file in blocks of about READ_BLOCK_SIZE characters.
+
+    Blocks end on a paragraph break, else a line break, else whitespace
+    (or exactly at the block size if there is none), so at most about two
+    blocks of the file's raw text are held in memory at once.
+    """
+    pending = ""
+    with path.open("r", encoding="utf-8", buffering=READ_BLOCK_SIZE) as f:
+        for block in iter(lambda: f.read(READ_BLOCK_SIZE), ""):
+            pending += block
+            if len(pending) < READ_BLOCK_SIZE:
+                continue
+
+            cut = pending.rfind("\n\n")
+            if cut <= 0:
+                cut = pending.rfind("\n")
+            if cut <= 0:
+                cut = max(pending.rfind(" "), pending.rfind("\t"))
+            if cut <= 0:
+                cut = READ_BLOCK_SIZE
+
+            yield pending[:cut]
+            pending = pending[cut:].lstrip()
+
+    if pending:
+        yield pending
+
+
+def chunk_file(path: Path) -> Dict[str, Any]:
+    """
+    Read and chunk a single document (run in ingestion's worker processes).
+
+    The text is read block by block (see iter_text_blocks), and the tail of
+    each block's last chunk (up to config.chunk_overlap characters) is
+    prepended to the next block, so chunk overlap carries across blocks.
+    All chunks of the file are still collected and returned together.
+
+    Returns
+    -------
+    Dict[str, Any]
+        {"source": filename, "chunks": list of chunk texts}.
+    """
+    chunks: List[str] = []
+    carry = ""
+    for block in iter_text_blocks(path):
+        if carry:
+            block = f"{carry}\n{block}"
+
+        block_chunks = split_text(
+            block, config.chunk_size, config.chunk_overlap)
+        chunks.extend(block_chunks)
+
+        carry = _overlap_tail(block_chunks, config.chunk_overlap)
+
+    return {"source": path.name, "chunks": chunks}
+
+
+def _overlap_tail(chunks: List[str], chunk_overlap: int) -> str:
+    """
+    Last chunk_overlap characters of the last chunk, starting at a word.
+    """
+    if not chunks or chunk_overlap <= 0:
+        return ""
+
+    last = chunks[-1]
+    tail = last[-chunk_overlap:]
+    if len(last) > chunk_overlap and " " in tail:
+        # Don't start the next block with a partial word
+        tail = tail[tail.index(" ") + 1:]
+    return tail
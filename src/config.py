@@ -31,6 +31,29 @@ class Config:
     max_tokens: int = int(os.getenv("LLM_MAX_TOKENS", "512"))
     temperature: float = float(os.getenv("LLM_TEMPERATURE", "0.2"))
     top_p: float = float(os.getenv("LLM_TOP_P", "0.9"))
+    # Bedrock prompt caching (opt-in; only some models support it, and the
+    # default model does not): cache points are set once the prefix they
+    # close (system prompt, then + context) reaches the minimum size
+    prompt_caching: bool = os.getenv(
+        "BEDROCK_PROMPT_CACHING", "false"
+    ).lower() in {"1", "true", "yes"}
+    prompt_cache_min_tokens: int = int(
+        os.getenv("BEDROCK_PROMPT_CACHE_MIN_TOKENS", "1024")
+    )
+    # Latency-optimized inference; only some models/regions support it
+    latency_optimized: bool = os.getenv(
+        "BEDROCK_LATENCY_OPTIMIZED", "false"
+    ).lower() in {"1", "true", "yes"}
+
+    # Client-side batching of concurrent questions (src/bedrock_batched.py)
+    batch_window_ms: float = float(os.getenv("BATCH_WINDOW_MS", "20"))
+    batch_max_size: int = int(os.getenv("BATCH_MAX_SIZE", "8"))
+    # Bedrock calls (batches and per-question fallbacks) run concurrently
+    batch_max_concurrency: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+    # Output token cap for one batched call (the model's max output tokens)
+    batch_max_output_tokens: int = int(
+        os.getenv("BATCH_MAX_OUTPUT_TOKENS", "4096")
+    )
 
     # Ingestion / preprocessing
     # Relative folder names under project root
@@ -40,12 +63,38 @@ class Config:
     # Chunking parameters
     chunk_size: int = int(os.getenv("CHUNK_SIZE", "400"))
     chunk_overlap: int = int(os.getenv("CHUNK_OVERLAP", "50"))
+    # Worker processes for loading/chunking documents (0 = one per CPU)
+    ingest_workers: int = int(os.getenv("INGEST_WORKERS", "0"))
+
+    # Embedding
+    embedding_model: str = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    # "onnx" (ONNX Runtime on CPU) or "torch" (PyTorch eager)
+    embedding_backend: str = os.getenv("EMBEDDING_BACKEND", "onnx")
+    embed_batch_size: int = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+    # Number of distinct query embeddings kept in the in-process LRU cache
+    query_cache_size: int = int(os.getenv("QUERY_CACHE_SIZE", "1024"))
+    # PyTorch backend only: intra-op threads (0 = all cores) and torch.compile
+    embed_num_threads: int = int(os.getenv("EMBED_NUM_THREADS", "0"))
+    embed_torch_compile: bool = os.getenv(
+        "EMBED_TORCH_COMPILE", "false"
+    ).lower() in {"1", "true", "yes"}
+    # PyTorch backend only: "auto" (fp16 on GPU, bf16 on CPUs with native
+    # bf16 support, fp32 otherwise), "fp32", "fp16" or "bf16"
+    embedding_precision: str = os.getenv("EMBEDDING_PRECISION", "auto")
 
     # Output filenames for embeddings and metadata
     embeddings_filename: str = os.getenv(
         "EMBEDDINGS_FILENAME", "chunks_embeddings.npy"
     )
-    meta_filename: str = os.getenv("META_FILENAME", "chunks_meta.npy")
+    quantized_embeddings_filename: str = os.getenv(
+        "QUANTIZED_EMBEDDINGS_FILENAME", "chunks_embeddings_i8.npy"
+    )
+    meta_filename: str = os.getenv("META_FILENAME", "chunks_meta.json")
+
+    # Optional FAISS index, used only when faiss-cpu is installed
+    # ("flat" = exact search, "hnsw" = approximate)
+    index_filename: str = os.getenv("INDEX_FILENAME", "chunks_index.faiss")
+    faiss_index_type: str = os.getenv("FAISS_INDEX_TYPE", "flat")
 
 
 # Single shared instance imported everywhere
@@ -4,14 +4,93 @@ Embedding utilities using SentenceTransformers.
 
 """
 
+from contextlib import nullcontext
+from functools import lru_cache
+from pathlib import Path
+import os
 from typing import List
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
+from .config import config
 
-# initial implementation : Just MiniLM
 
-_model = SentenceTransformer("all-MiniLM-L6-v2")
+# Downloaded model files are cached under the data directory
+ROOT_DIR = Path(__file__).resolve().parents[1]
+MODELS_DIR = ROOT_DIR / config.data_subdir / "models"
+
+# Set by _get_model(): run encode() under CPU bfloat16 autocast
+_CPU_AUTOCAST_BF16 = False
+
+
+def _resolve_precision(device_type: str) -> str:
+    """
+    Pick the numeric precision for the PyTorch backend on this hardware.
+    """
+
+    import torch
+
+    if config.embedding_precision != "auto":
+        return config.embedding_precision
+    if device_type == "cuda":
+        return "fp16"
+
+    bf16_supported = getattr(torch.cpu, "_is_avx512_bf16_supported", None)
+    if device_type == "cpu" and bf16_supported is not None and bf16_supported():
+        return "bf16"
+    return "fp32"
+
+
+@lru_cache(maxsize=1)
+def _get_model() -> SentenceTransformer:
+    """
+    Load the embedding model once, on first use.
+
+    With the "onnx" backend the encoder runs on ONNX Runtime's CPU provider;
+    the ONNX graph bundled with the model (all-MiniLM-L6-v2 ships one) is
+    downloaded once and cached in MODELS_DIR. Models without bundled ONNX
+    files are exported on the fly at every load; the export is not saved.
+    With the "torch" backend, PyTorch uses all cores, fused SDPA attention,
+    reduced precision where the hardware supports it, and optionally
+    torch.compile (config.embed_torch_compile).
+    """
+
+    global _CPU_AUTOCAST_BF16
+
+    if config.embedding_backend == "onnx":
+        return SentenceTransformer(
+            config.embedding_model,
+            backend="onnx",
+            model_kwargs={"provider": "CPUExecutionProvider"},
+            cache_folder=str(MODELS_DIR),
+        )
+
+    import torch
+
+    torch.set_num_threads(config.embed_num_threads or os.cpu_count() or 4)
+
+    model = SentenceTransformer(
+        config.embedding_model,
+        cache_folder=str(MODELS_DIR),
+        model_kwargs={"attn_implementation": "sdpa"},
+    )
+
+    precision = _resolve_precision(model.device.type)
+    if precision == "fp16":
+        model.half()
+    elif precision == "bf16":
+        if model.device.type == "cpu":
+            _CPU_AUTOCAST_BF16 = True
+        else:
+            model.bfloat16()
+
+    if config.embed_torch_compile:
+        transformer = model[0]
+        transformer.auto_model = torch.compile(
+            transformer.auto_model, mode="reduce-overhead", dynamic=True
+        )
+
+    return model
 
 
 def embed_texts(texts: List[str]) -> np.ndarray:
@@ -29,5 +108,57 @@ def embed_texts(texts: List[str]) -> np.ndarray:
         Array of shape (n_texts, embedding_dim) with float32 embeddings.
     """
 
-    embeddings = _model.encode(texts, normalize_embeddings=True)
-    return np.array(embeddings, dtype=np.float32)
+    model = _get_model()
+
+    if _CPU_AUTOCAST_BF16:
+        import torch
+        precision_ctx = torch.autocast(device_type="cpu", dtype=torch.bfloat16)
+    else:
+        precision_ctx = nullcontext()
+
+    # encode() already sorts each call's inputs by length before batching,
+    # so padding stays minimal without re-ordering the texts here.
+    with precision_ctx:
+        embeddings = model.encode(
+            texts,
+            batch_size=config.embed_batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
+
+    # Always float32 on output, matching the stored .npy files
+    return embeddings.astype(np.float32, copy=False)
+
+
+@lru_cache(maxsize=config.query_cache_size)
+def embed_one(text: str) -> bytes:
+    """
+    Embed a single query string, caching results for repeated queries.
+
+    Returns the raw float32 bytes (hashable and immutable, unlike an
+    ndarray); decode with np.frombuffer(..., dtype=np.float32).
+    """
+
+    return embed_texts([text])[0].tobytes()
+
+
+def quantize_embeddings(embeddings: np.ndarray) -> np.ndarray:
+    """
+    Quantize L2-normalized embeddings to int8 (scale by 127 and clip).
+
+    Components of normalized MiniLM vectors lie in [-1, 1], so the rounding
+    error is at most 1/254 per dimension; cosine rankings are practically
+    unchanged while the stored matrix shrinks 4x.
+
+    Parameters
+    ----------
+    embeddings : np.ndarray
+        Float embeddings of shape (..., embedding_dim).
+
+    Returns
+    -------
+    np.ndarray
+        Array of the same shape with int8 values.
+    """
+
+    return np.clip(np.round(embeddings * 127), -127, 127).astype(np.int8)
@@ -6,15 +6,18 @@ This script:
 2. Splits them into overlapping text chunks.
 3. Embeds all chunks using SentenceTransformers.
 4. Saves embeddings and metadata to the data directory.
+5. Builds a FAISS index over the embeddings (if FAISS is installed).
 
 These outputs are later used by the retriever for similarity search.
 """
 
+import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any
 import numpy as np
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from .embeddings import embed_texts
+
+from .chunking import chunk_file
 from .logger import setup_logger
 from .config import config
 
@@ -29,84 +32,97 @@ DATA_DIR = ROOT_DIR / config.data_subdir
 DATA_DIR.mkdir(exist_ok=True)
 
 
-def load_documents() -> List[Dict[str, Any]]:
+def load_and_chunk_documents() -> List[Dict[str, Any]]:
     """
-    Load all .txt documents from the docs directory.
+    Load and chunk all .txt documents in parallel, one file per task.
+
+    Files are read and split in a process pool (config.ingest_workers,
+    0 = one per CPU); chunk ids are assigned afterwards in file order.
 
     Returns
     -------
     List[Dict[str, Any]]
-        Each item contains {"source": filename, "text": file_contents}.
+        List of dictionaries: {"id", "source", "text"}.
     """
 
-    docs: List[Dict[str, Any]] = []
-    for path in DOCS_DIR.glob("*.txt"):
-        text = path.read_text(encoding="utf-8")
-        docs.append({"source": path.name, "text": text})
+    paths = sorted(DOCS_DIR.glob("*.txt"))
+    logger.info(f"Found {len(paths)} documents")
+
+    with ProcessPoolExecutor(max_workers=config.ingest_workers or None) as ex:
+        per_file = list(ex.map(chunk_file, paths))
+
+    all_chunks: List[Dict[str, Any]] = []
+    chunk_id = 0
+
+    for doc in per_file:
+        source = doc["source"]
+        logger.info(f"Chunked {source} into {len(doc['chunks'])} chunks")
+
+        for ch in doc["chunks"]:
+            all_chunks.append({
+                "id": chunk_id,
+                "source": source,
+                "text": ch
+            })
+            chunk_id += 1
+
+    return all_chunks
 
-    return docs
+
+def _import_faiss() -> Any:
+    """
+    Import FAISS on demand; returns None if the optional package is missing.
+
+    Like the embedding model, FAISS is not imported at module level: workers
+    spawned for chunking re-import this module and need neither.
+    """
+    try:
+        import faiss
+    except ImportError:  # optional ANN index; retriever falls back to a scan
+        return None
+    return faiss
 
 
-def chunk_documents(
-        documents: List[Dict[str, Any]],
-        chunk_size: int = config.chunk_size,
-        chunk_overlap: int = config.chunk_overlap,
-) -> List[Dict[str, Any]]:
+def build_faiss_index(embeddings: np.ndarray) -> Any:
     """
-    Split documents into overlapping text chunks using LangChain's splitter.
+    Build a FAISS inner-product index over normalized embeddings.
 
     Parameters
     ----------
-    documents : List[Dict[str, Any]]
-        Input documents from load_documents().
-    chunk_size : int
-        Maximum length of each chunk.
-    chunk_overlap : int
-        Overlap between consecutive chunks.
+    embeddings : np.ndarray
+        Float32 array of shape (n_chunks, embedding_dim).
 
     Returns
     -------
-    List[Dict[str, Any]]
-        List of dictionaries: {"id", "source", "text"}.
+    faiss.Index
+        Exact (IndexFlatIP) or approximate (IndexHNSWFlat) index,
+        depending on config.faiss_index_type.
     """
 
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap
-    )
-
-    all_chunks: List[Dict[str, Any]] = []
-    chunk_id = 0
-
-    for doc in documents:
-        source = doc["source"]
-        text = doc["text"]
+    faiss = _import_faiss()
+    dim = embeddings.shape[1]
 
-        chunks = splitter.split_text(text)
-        logger.info(f"Chunked {source} into {len(chunks)} chunks")
+    if config.faiss_index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+    elif config.faiss_index_type == "flat":
+        index = faiss.IndexFlatIP(dim)
+    else:
+        raise ValueError(
+            f"Unknown FAISS index type: {config.faiss_index_type!r}")
 
-        for ch in chunks:
-            ch = ch.strip()
-            if ch:
-                all_chunks.append({
-                    "id": chunk_id,
-                    "source": source,
-                    "text": ch
-                })
-                chunk_id += 1
-
-    return all_chunks
+    index.add(np.ascontiguousarray(embeddings, dtype=np.float32))
+    return index
 
 
 def main() -> None:
     """Run the ingestion pipeline and save embeddings + metadata to disk."""
 
-    logger.info(f"Loading documents from: {DOCS_DIR}")
-    documents = load_documents()
-    logger.info(f"Loaded {len(documents)} documents")
+    # Deferred so chunking workers don't load the embedding model
+    from .embeddings import embed_texts, quantize_embeddings
 
-    logger.info("Splitting using RecursiveCharacterTextSplitter...")
-    chunks = chunk_documents(documents)
+    logger.info(f"Loading documents from: {DOCS_DIR}")
+    logger.info("Splitting using semantic-text-splitter...")
+    chunks = load_and_chunk_documents()
     logger.info(f"Total chunks created: {len(chunks)}")
 
     texts = [c["text"] for c in chunks]
@@ -117,27 +133,39 @@ def main() -> None:
 
     # Save embeddings + metadata
     embeddings_path = DATA_DIR / config.embeddings_filename
+    quantized_path = DATA_DIR / config.quantized_embeddings_filename
     meta_path = DATA_DIR / config.meta_filename
 
+    # Contiguous float32 so the retriever can memory-map it as-is
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
     np.save(embeddings_path, embeddings)
+    np.save(quantized_path, quantize_embeddings(embeddings))
 
-    # Structured Numpy array for metadata storage
-    meta_dtype = np.dtype([
-        ("id", np.int32),
-        ("source", "U128"),
-        ("text", "U4000"),
-    ])
-
-    meta = np.empty(len(chunks), dtype=meta_dtype)
-    for i, c in enumerate(chunks):
-        meta[i]["id"] = c["id"]
-        meta[i]["source"] = c["source"]
-        meta[i]["text"] = c["text"]
-
-    np.save(meta_path, meta)
+    # Column-oriented JSON for metadata: row i matches embeddings[i], and
+    # strings take only their actual length (no fixed-width padding)
+    meta = {
+        "id": [c["id"] for c in chunks],
+        "source": [c["source"] for c in chunks],
+        "text": texts,
+    }
+    meta_path.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
 
     logger.success(f"Saved embeddings -> {embeddings_path}")
+    logger.success(f"Saved int8 embeddings -> {quantized_path}")
     logger.success(f"Saved metadata   -> {meta_path}")
+
+    index_path = DATA_DIR / config.index_filename
+    faiss = _import_faiss()
+    if faiss is not None:
+        logger.info(f"Building FAISS index ({config.faiss_index_type})...")
+        index = build_faiss_index(embeddings)
+        faiss.write_index(index, str(index_path))
+        logger.success(f"Saved FAISS index -> {index_path}")
+    else:
+        logger.info("faiss not installed; skipping optional FAISS index.")
+        # Don't leave an index from a previous run out of sync with the data
+        index_path.unlink(missing_ok=True)
+
     logger.success("Ingestion completed successfully!")
 
 
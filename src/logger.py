@@ -10,13 +10,23 @@ import sys
 from loguru import logger
 
 
+# Whether the stdout handler has been installed already
+_CONFIGURED = False
+
+
 def setup_logger():
     """
     Configure and return a Loguru logger instance.
 
     Removes the default Loguru handler and adds a clean stdout logger
-    with timestamp, log level, and colored output.
+    with timestamp, log level, and colored output. Only the first call
+    configures handlers; later calls return the same logger.
     """
+    global _CONFIGURED
+
+    if _CONFIGURED:
+        return logger
+
     # remove default handler
     logger.remove()
     logger.add(
@@ -25,4 +35,5 @@ def setup_logger():
         level="INFO",
         colorize=True,
     )
+    _CONFIGURED = True
     return logger
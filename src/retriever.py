@@ -9,12 +9,23 @@ This module:
 """
 
 
+import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 import numpy as np
 
-from .embeddings import embed_texts
+try:
+    import simsimd
+except ImportError:  # optional SIMD kernels; fall back to NumPy
+    simsimd = None
+
+try:
+    import faiss
+except ImportError:  # optional ANN index; fall back to a linear scan
+    faiss = None
+
+from .embeddings import embed_one, quantize_embeddings
 from .logger import setup_logger
 from .config import config
 
@@ -26,34 +37,125 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 DATA_DIR = ROOT_DIR / config.data_subdir
 
 EMBEDDINGS_PATH = DATA_DIR / config.embeddings_filename
+QUANTIZED_EMBEDDINGS_PATH = DATA_DIR / config.quantized_embeddings_filename
 META_PATH = DATA_DIR / config.meta_filename
+INDEX_PATH = DATA_DIR / config.index_filename
 
 # Globals for lazy-loaded index
 _CHUNK_EMBEDDINGS: np.ndarray | None = None
-_CHUNK_META: np.ndarray | None = None
+_CHUNK_META: Dict[str, List[Any]] | None = None
+_FAISS_INDEX: Any = None
+
+
+def format_chunk(source: str, text: str) -> str:
+    """Format a chunk for the LLM context, without its similarity score."""
+    return f"[Source: {source}]\n{text}"
 
 
 def _load_index() -> None:
     """
-    Load embeddings and metadata into memory (only once).
+    Load metadata and memory-map embeddings (only once).
 
     Uses lazy loading so the index is loaded on first retrieval call,
-    not during import time.
+    not during import time. By default the int8 embeddings are scanned
+    with SimSIMD (float32 with NumPy if SimSIMD is missing). If FAISS is
+    installed (opt-in) and a FAISS index was written at ingestion, the
+    memory-mapped index is used instead.
     """
 
-    global _CHUNK_EMBEDDINGS, _CHUNK_META
+    global _CHUNK_EMBEDDINGS, _CHUNK_META, _FAISS_INDEX
 
-    if _CHUNK_EMBEDDINGS is not None and _CHUNK_META is not None:
+    if _CHUNK_META is not None and (
+        _CHUNK_EMBEDDINGS is not None or _FAISS_INDEX is not None
+    ):
         return
 
-    logger.info(f"Loading embeddings from {EMBEDDINGS_PATH}")
     logger.info(f"Loading metadata   from {META_PATH}")
+    _CHUNK_META = json.loads(META_PATH.read_text(encoding="utf-8"))
+    # Prompt-ready "[Source: ...]" + text per chunk, so queries only add the
+    # score (built here rather than stored, to keep the metadata file small)
+    _CHUNK_META["context"] = [
+        format_chunk(source, text)
+        for source, text in zip(_CHUNK_META["source"], _CHUNK_META["text"])
+    ]
+    logger.info(f"Loaded meta for {len(_CHUNK_META['id'])} chunks")
+
+    if faiss is not None and INDEX_PATH.exists():
+        logger.info(f"Loading FAISS index from {INDEX_PATH}")
+        # MMAP_IFC maps flat/HNSW vector storage too (IO_FLAG_MMAP only maps
+        # IVF inverted lists and would read these indexes into RAM)
+        _FAISS_INDEX = faiss.read_index(
+            str(INDEX_PATH), faiss.IO_FLAG_MMAP_IFC
+        )
+        logger.info(f"Loaded FAISS index with {_FAISS_INDEX.ntotal} vectors")
+        return
 
-    _CHUNK_EMBEDDINGS = np.load(EMBEDDINGS_PATH)
-    _CHUNK_META = np.load(META_PATH)
+    # int8 embeddings are only useful with SimSIMD's i8 kernels
+    if simsimd is not None and QUANTIZED_EMBEDDINGS_PATH.exists():
+        embeddings_path = QUANTIZED_EMBEDDINGS_PATH
+    else:
+        embeddings_path = EMBEDDINGS_PATH
 
+    logger.info(f"Loading embeddings from {embeddings_path}")
+    # Memory-map so pages are read on demand and shared between processes
+    _CHUNK_EMBEDDINGS = np.load(embeddings_path, mmap_mode="r")
     logger.info(f"Loaded embeddings with shape: {_CHUNK_EMBEDDINGS.shape}")
-    logger.info(f"Loaded meta with shape: {_CHUNK_META.shape}")
+
+
+def _similarity_scores(query_emb: np.ndarray) -> np.ndarray:
+    """
+    Compute cosine similarity between the query and every stored chunk.
+
+    Uses SimSIMD kernels when available, otherwise a NumPy dot product
+    (embeddings are normalized, so both give the same scores). If the stored
+    embeddings are int8-quantized, the query is quantized the same way.
+    """
+    assert _CHUNK_EMBEDDINGS is not None
+
+    if _CHUNK_EMBEDDINGS.dtype == np.int8:
+        query_emb = quantize_embeddings(query_emb)
+
+    if simsimd is not None:
+        distances = simsimd.cdist(
+            query_emb[None, :], _CHUNK_EMBEDDINGS, metric="cosine"
+        )
+        return 1.0 - np.asarray(distances, dtype=np.float32).ravel()
+
+    return _CHUNK_EMBEDDINGS @ query_emb
+
+
+def _search(query_emb: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the top-k chunks for a query embedding.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        Row indices and their similarity scores, best match first.
+    """
+
+    if _FAISS_INDEX is not None:
+        top_k = min(top_k, _FAISS_INDEX.ntotal)
+        if top_k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        # Inner product on normalized vectors = cosine similarity
+        distances, indices = _FAISS_INDEX.search(query_emb[None, :], top_k)
+        found = indices[0] >= 0  # ANN indexes pad missing hits with -1
+        return indices[0][found], distances[0][found]
+
+    # Embeddings are normalized => cosine similarity = dot product
+    scores = _similarity_scores(query_emb)  # shape (N,)
+
+    # Limit top_k to available chunks
+    top_k = min(top_k, scores.shape[0])
+    if top_k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+    # Partial selection of the top-k (O(N)), then sort only those k entries
+    candidates = np.argpartition(scores, -top_k)[-top_k:]
+    top_indices = candidates[np.argsort(-scores[candidates])]
+    return top_indices, scores[top_indices]
 
 
 def retrieve_relevant_chunks(
@@ -73,51 +175,58 @@ def retrieve_relevant_chunks(
     Returns
     -------
     List[Dict[str, Any]]
-        Each entry contains {"id", "source", "text", "score"}.
+        Each entry contains {"id", "source", "text", "score", "context"},
+        where "context" is the chunk preformatted for prompts.
     """
 
     _load_index()
-    assert _CHUNK_EMBEDDINGS is not None
     assert _CHUNK_META is not None
 
     # Embed query → (D,)
-    query_emb = embed_texts([query])[0]
-    query_emb = query_emb.astype(np.float32)
-
-    # Embeddings are normalized => cosine similarity = dot product
-    scores = _CHUNK_EMBEDDINGS @ query_emb  # shape (N,)
-
-    # Limit top_k to available chunks
-    top_k = min(top_k, scores.shape[0])
-    top_indices = np.argsort(scores)[-top_k:][::-1]
-
-    results: List[Dict[str, Any]] = []
-    for idx in top_indices:
-        meta_row = _CHUNK_META[idx]
-        results.append(
-            {
-                "id": int(meta_row["id"]),
-                "source": str(meta_row["source"]),
-                "text": str(meta_row["text"]),
-                "score": float(scores[idx]),
-            }
-        )
+    query_emb = np.frombuffer(embed_one(query), dtype=np.float32)
+
+    top_indices, top_scores = _search(query_emb, top_k)
+
+    # Gather from the metadata columns; tolist() converts all indices and
+    # scores to Python numbers at once instead of boxing NumPy scalars per hit
+    ids = _CHUNK_META["id"]
+    sources = _CHUNK_META["source"]
+    texts = _CHUNK_META["text"]
+    contexts = _CHUNK_META["context"]
+
+    results: List[Dict[str, Any]] = [
+        {
+            "id": ids[idx],
+            "source": sources[idx],
+            "text": texts[idx],
+            "score": score,
+            "context": contexts[idx],
+        }
+        for idx, score in zip(top_indices.tolist(), top_scores.tolist())
+    ]
 
     logger.info(
-        f"Retrieved top {top_k} chunks for query: {query!r}"
+        f"Retrieved top {len(results)} chunks for query: {query!r}"
     )
     return results
 
 
-def format_context(chunks: List[Dict[str, Any]]) -> str:
+def format_context(
+    chunks: List[Dict[str, Any]], include_scores: bool = True
+) -> str:
     """
     Format retrieved chunks into a single context string for prompts.
-    Includes source information and similarity score.
+    Includes source information and, unless include_scores is False,
+    similarity score.
+
+    Chunks from retrieve_relevant_chunks() carry their source header + text
+    preformatted ("context"), so only the score is formatted per query;
+    other chunks are formatted from their own source and text.
     """
     parts: List[str] = []
     for c in chunks:
-        header = f"[Source: {c['source']} | Score: {c['score']:.3f}]"
-        parts.append(header)
-        parts.append(c["text"])
-        parts.append("")
+        formatted = c.get("context") or format_chunk(c["source"], c["text"])
+        if include_scores:
+            formatted = f"[Score: {c['score']:.3f}] {formatted}"
+        parts.append(f"{formatted}\n")
     return "\n".join(parts)